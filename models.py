@@ -1,69 +1,120 @@
+import cmath
 import math
+from dataclasses import dataclass
 
-input_coordinates = []
-output_coordinates = []
+import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# Below this many coordinates the NumPy ufuncs are faster than starting numba's threads
+NUMBA_THRESHOLD = 10_000
+
+@dataclass(slots=True, frozen=True)
 class PolarCoordinate:
-    def __init__(self, distance: float, angle: float):
-        self.distance = distance
-        self.angle = angle
+    distance: float
+    angle: float
     
     def __str__(self):
         return f"<PolarCoordinate, distance={self.distance:.4f}, angle={self.angle:.4f}>"
 
+@dataclass(slots=True, frozen=True)
 class RectangularCoordinate:
-    def __init__(self, northing: float, easting: float):
-        self.northing = northing
-        self.easting = easting
+    northing: float
+    easting: float
 
     def __str__(self):
         return f"<RectangularCoordinate, northing={self.northing:.4f}, easting={self.easting:.4f}>"
 
+class PolarTable:
+    def __init__(self, distance: np.ndarray, angle: np.ndarray):
+        self.distance = np.asarray(distance, dtype=np.float64)
+        self.angle = np.asarray(angle, dtype=np.float64)
+
+    def __len__(self):
+        return self.distance.size
+
+    def __getitem__(self, i: int) -> PolarCoordinate:
+        return PolarCoordinate(self.distance[i], self.angle[i])
+
+class RectTable:
+    def __init__(self, northing: np.ndarray, easting: np.ndarray):
+        self.northing = np.asarray(northing, dtype=np.float64)
+        self.easting = np.asarray(easting, dtype=np.float64)
+
+    def __len__(self):
+        return self.northing.size
+
+    def __getitem__(self, i: int) -> RectangularCoordinate:
+        return RectangularCoordinate(self.northing[i], self.easting[i])
+
 def polar_to_rect(coord: PolarCoordinate) -> RectangularCoordinate:
-    northing = coord.distance * math.cos(coord.angle)
-    easting = coord.distance * math.sin(coord.angle)
-    return RectangularCoordinate(northing, easting)
+    point = cmath.rect(coord.distance, coord.angle)
+    return RectangularCoordinate(point.real, point.imag)
 
 def rect_to_polar(coord: RectangularCoordinate) -> PolarCoordinate:
-    distance = math.sqrt(coord.northing ** 2 + coord.easting ** 2)
+    distance = math.hypot(coord.northing, coord.easting)
     angle = math.atan2(coord.easting, coord.northing)
     return PolarCoordinate(distance, angle)
 
-def transform_coordinates(input: list):
-    if isinstance(input[0], PolarCoordinate):
-        for i in range(0, len(input)):
-            coord = polar_to_rect(input[i])
-            output_coordinates.append(coord)
-            print(coord)
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def polar_to_rect_batch(distance, angle, out_northing, out_easting):
+        for i in prange(distance.size):
+            out_northing[i] = distance[i] * math.cos(angle[i])
+            out_easting[i] = distance[i] * math.sin(angle[i])
+
+    @njit(parallel=True, cache=True)
+    def rect_to_polar_batch(northing, easting, out_distance, out_angle):
+        for i in prange(northing.size):
+            out_distance[i] = math.hypot(northing[i], easting[i])
+            out_angle[i] = math.atan2(easting[i], northing[i])
+
+def transform_coordinates(input: PolarTable | RectTable) -> PolarTable | RectTable:
+    n = len(input)
+    first = np.empty(n)
+    second = np.empty(n)
+    use_numba = njit is not None and n > NUMBA_THRESHOLD
+    if isinstance(input, PolarTable):
+        if use_numba:
+            polar_to_rect_batch(input.distance, input.angle, first, second)
+        else:
+            np.multiply(input.distance, np.cos(input.angle), out=first)
+            np.multiply(input.distance, np.sin(input.angle), out=second)
+        return RectTable(first, second)
+    if use_numba:
+        rect_to_polar_batch(input.northing, input.easting, first, second)
     else:
-        for i in range(0, len(input)):
-            coord = rect_to_polar(input[i])
-            output_coordinates.append(coord)
-            print(coord)
-    print()
+        np.hypot(input.northing, input.easting, out=first)
+        np.arctan2(input.easting, input.northing, out=second)
+    return PolarTable(first, second)
 
-def collect_coordinates():
+def collect_coordinates() -> PolarTable | RectTable:
     print("\nHello")
     coordinate_system = input("Enter input the coordinate system 'Rectangular | Polar': ").lower()
     input_count = int(input("Enter number of coordinates to insert: "))
     print()
     
+    first = np.empty(input_count)
+    second = np.empty(input_count)
     if coordinate_system == "polar":
         for count in range(0, input_count):
-            coord = PolarCoordinate(0, 0)
-            coord.distance = float(input(f"Distance ({count + 1}): "))
-            coord.angle = float(input(f"Angle ({count + 1}): "))
-            print()
-            input_coordinates.append(coord)
-    else:
-        for count in range(0, input_count):
-            coord = RectangularCoordinate(0, 0)
-            coord.northing = float(input(f"Northing ({count + 1}): "))
-            coord.easting = float(input(f"Easting ({count + 1}): "))
+            first[count] = float(input(f"Distance ({count + 1}): "))
+            second[count] = float(input(f"Angle ({count + 1}): "))
             print()
-            input_coordinates.append(coord)
-    print()
-    transform_coordinates(input_coordinates)
+        return PolarTable(first, second)
+    for count in range(0, input_count):
+        first[count] = float(input(f"Northing ({count + 1}): "))
+        second[count] = float(input(f"Easting ({count + 1}): "))
+        print()
+    return RectTable(first, second)
 
 def start():
-    collect_coordinates()
\ No newline at end of file
+    input_coordinates = collect_coordinates()
+    print()
+    output_coordinates = transform_coordinates(input_coordinates)
+    for i in range(0, len(output_coordinates)):
+        print(output_coordinates[i])
+    print()
@@ -1,9 +1,15 @@
 import streamlit as st
+import cmath
+import csv
+import io
 import math
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+import warnings
+from dataclasses import dataclass
 import numpy as np
+import plotly.graph_objects as go
+
+# pandas and numba (via kernels) are only needed once a batch is processed, so
+# they are imported there and the first page load doesn't wait for them
 
 # Set page config FIRST
 st.set_page_config(
@@ -33,23 +39,49 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# Degree/radian conversion factors, hoisted out of the per-coordinate paths
+DEG2RAD = math.pi / 180.0
+RAD2DEG = 180.0 / math.pi
+
+# Quadrant names indexed by ((northing < 0) << 1) | (easting < 0)
+QUADRANTS = (
+    "NE (First Quadrant)",
+    "NW (Second Quadrant)",
+    "SE (Fourth Quadrant)",
+    "SW (Third Quadrant)",
+)
+
+# Bearing (prefix, suffix, measured back from the next cardinal) per 90° sector
+BEARING_SECTORS = (
+    ("N", "E", False),
+    ("S", "E", True),
+    ("S", "W", False),
+    ("N", "W", True),
+)
+
+# Batches larger than this are shown as a 2D histogram instead of individual markers
+OVERVIEW_HEATMAP_THRESHOLD = 5000
+
+
+@dataclass(slots=True, frozen=True)
 class PolarCoordinate:
     """Represents a coordinate in polar system (distance, angle)"""
-    def __init__(self, distance: float, angle: float):
-        if distance < 0:
+    distance: float
+    angle: float
+    
+    def __post_init__(self):
+        if self.distance < 0:
             raise ValueError("Distance must be non-negative")
-        self.distance = distance
-        self.angle = angle
    
     def __str__(self):
         return f"Distance: {self.distance:.4f}m, Angle: {self.angle:.4f}°"
 
 
+@dataclass(slots=True, frozen=True)
 class RectangularCoordinate:
     """Represents a coordinate in rectangular system (northing, easting)"""
-    def __init__(self, northing: float, easting: float):
-        self.northing = northing
-        self.easting = easting
+    northing: float
+    easting: float
     
     def __str__(self):
         return f"Northing: {self.northing:.4f}m, Easting: {self.easting:.4f}m"
@@ -57,103 +89,213 @@ class RectangularCoordinate:
 
 def polar_to_rect(coord: PolarCoordinate) -> RectangularCoordinate:
     """Convert polar coordinates to rectangular coordinates"""
-    angle_rad = math.radians(coord.angle)
-    northing = coord.distance * math.cos(angle_rad)
-    easting = coord.distance * math.sin(angle_rad)
-    return RectangularCoordinate(northing, easting)
+    # cmath.rect evaluates cos and sin of the same angle in one C call
+    point = cmath.rect(coord.distance, coord.angle * DEG2RAD)
+    return RectangularCoordinate(point.real, point.imag)
 
 
 def rect_to_polar(coord: RectangularCoordinate) -> PolarCoordinate:
     """Convert rectangular coordinates to polar coordinates"""
-    distance = math.sqrt(coord.northing ** 2 + coord.easting ** 2)
+    distance = math.hypot(coord.northing, coord.easting)
     angle_rad = math.atan2(coord.easting, coord.northing)
-    angle_deg = math.degrees(angle_rad)
     # Normalize angle to 0-360 range
-    if angle_deg < 0:
-        angle_deg += 360
+    angle_deg = angle_rad * RAD2DEG % 360.0
     return PolarCoordinate(distance, angle_deg)
 
 
-def create_coordinate_plot(northing, easting, distance, angle, mode):
-    """Create an interactive plot showing the coordinate system"""
-    
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=(10, 10))
+def quadrant_name(northing: float, easting: float) -> str:
+    """Name the quadrant a point falls in from the signs of its northing and easting"""
+    return QUADRANTS[((northing < 0) << 1) | (easting < 0)]
+
+
+def bearing_string(angle: float) -> str:
+    """Format an angle clockwise from North (0-360°) as a quadrant bearing"""
+    sector = min(max(math.ceil(angle / 90) - 1, 0), 3)
+    prefix, suffix, reflect = BEARING_SECTORS[sector]
+    offset = angle - sector * 90
+    return f"{prefix} {90 - offset if reflect else offset:.2f}° {suffix}"
+
+
+def batch_polar_to_rect(distance: np.ndarray, angle: np.ndarray):
+    """Convert arrays of polar coordinates to arrays of northings and eastings"""
+    from kernels import polar_to_rect_kernel
+    if polar_to_rect_kernel is not None:
+        return polar_to_rect_kernel(distance, angle)
+    # One contiguous radian array shared by both ufuncs
+    angle_rad = np.asarray(angle, dtype=np.float64) * DEG2RAD
+    return distance * np.cos(angle_rad), distance * np.sin(angle_rad)
+
+
+def batch_rect_to_polar(northing: np.ndarray, easting: np.ndarray):
+    """Convert arrays of rectangular coordinates to arrays of distances and angles"""
+    distance = np.hypot(northing, easting)
+    angle_deg = np.arctan2(easting, northing) * RAD2DEG % 360.0
+    return distance, angle_deg
+
+
+def parse_batch(text: str):
+    """Parse comma-separated coordinate pairs, one per line, into an (N, 2) array
+    and a boolean mask of the lines that parsed"""
+    import pandas as pd
+    text = text.strip()
+    try:
+        # Fast path: pandas' C tokenizer; blank or single-value lines come back as NaN
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', pd.errors.ParserWarning)
+            frame = pd.read_csv(
+                io.StringIO(text),
+                header=None,
+                names=['first', 'second'],
+                index_col=False,
+                dtype=np.float64,
+                skip_blank_lines=False,
+                # A quoted field could span a newline and merge two lines into one row
+                quoting=csv.QUOTE_NONE,
+                engine='c'
+            )
+        values = frame.to_numpy()
+        return values, ~np.isnan(values).any(axis=1)
+    except (ValueError, pd.errors.ParserWarning):
+        # Slow path: some line has extra fields or a non-numeric value
+        lines = text.split('\n')
+        values = np.empty((len(lines), 2))
+        valid = np.ones(len(lines), dtype=bool)
+        for i, line in enumerate(lines):
+            try:
+                first, second = line.split(',')
+                values[i] = float(first), float(second)
+            except ValueError:
+                valid[i] = False
+        # float() accepts 'nan', which the fast path treats as invalid
+        valid &= ~np.isnan(values).any(axis=1)
+        return values, valid
+
+
+@st.cache_resource
+def base_plot_layout() -> go.Layout:
+    """Build the input-independent plot styling and labels once per server process"""
+    # Equal aspect ratio, grid and main axes through the origin
+    axis_style = dict(
+        showgrid=True, gridcolor='lightgray', griddash='dash',
+        zeroline=True, zerolinecolor='gray', zerolinewidth=1.5
+    )
+    return go.Layout(
+        title=dict(text='<b>Coordinate Visualization</b>', x=0.5),
+        xaxis=dict(title='<b>Easting (m)</b>', **axis_style),
+        yaxis=dict(title='<b>Northing (m)</b>', scaleanchor='x', scaleratio=1, **axis_style),
+        legend=dict(x=1, y=1, xanchor='right', bgcolor='rgba(255, 255, 255, 0.9)'),
+        plot_bgcolor='white',
+        height=700,
+        shapes=[
+            # Origin point, a fixed-size circle at the data origin
+            dict(
+                type='circle', xsizemode='pixel', ysizemode='pixel',
+                xanchor=0, yanchor=0, x0=-6, x1=6, y0=-6, y1=6,
+                fillcolor='green', line=dict(color='green'),
+                name='Origin', showlegend=True
+            )
+        ],
+        annotations=[
+            # Origin label sits at fixed data coordinates
+            dict(
+                x=0, y=0,
+                text='Origin (0, 0)',
+                showarrow=False, xshift=50, yshift=-25,
+                bgcolor='lightgreen', opacity=0.8
+            ),
+            # Cardinal direction labels, placed in paper coordinates so they
+            # stay near the plot edges whatever the axis limits are
+            *(
+                dict(
+                    x=x, y=y, xref='paper', yref='paper', text=f'<b>{label}</b>',
+                    showarrow=False, font=dict(size=16, color='blue')
+                )
+                for label, x, y in (('N', 0.5, 0.95), ('E', 0.95, 0.5),
+                                    ('S', 0.5, 0.05), ('W', 0.05, 0.5))
+            )
+        ]
+    )
+
+
+@st.cache_data(max_entries=128, ttl=3600, show_spinner=False)
+def create_coordinate_plot(northing, easting, distance, angle, mode) -> dict:
+    """Create an interactive plot of the coordinate system as a cached Plotly figure dict"""
     
     # Calculate plot limits
     max_val = max(abs(northing), abs(easting), distance) * 1.3
     if max_val == 0:
         max_val = 100
     
-    # Set equal aspect ratio and limits
-    ax.set_aspect('equal')
-    ax.set_xlim(-max_val, max_val)
-    ax.set_ylim(-max_val, max_val)
-    
-    # Add grid
-    ax.grid(True, linestyle='--', alpha=0.3, color='gray')
-    
-    # Draw main axes
-    ax.axhline(y=0, color='gray', linewidth=1.5, linestyle='-', alpha=0.5)
-    ax.axvline(x=0, color='gray', linewidth=1.5, linestyle='-', alpha=0.5)
+    fig = go.Figure(layout=base_plot_layout())
     
     # Add polar angle arc if converting from polar
     if mode == "polar" and distance > 0:
-        angle_rad = math.radians(angle)
+        angle_rad = angle * DEG2RAD
         arc_radius = distance * 0.3
-        arc_angles = np.linspace(0, angle_rad, 50)
-        arc_x = arc_radius * np.sin(arc_angles)
-        arc_y = arc_radius * np.cos(arc_angles)
-        ax.plot(arc_x, arc_y, 'orange', linewidth=2, label=f'Angle: {angle:.2f}°')
+        # About one point per degree, capped at 64, keeps the arc smooth
+        # without sending more geometry than the browser can show
+        arc_points = max(2, min(int(angle) + 1, 64))
+        # One complex exponential yields cos (real) and sin (imag) together
+        arc = arc_radius * np.exp(1j * np.linspace(0, angle_rad, arc_points))
+        fig.add_trace(go.Scatter(
+            x=arc.imag, y=arc.real, mode='lines',
+            line=dict(color='orange', width=2),
+            name=f'Angle: {angle:.2f}°'
+        ))
     
     # Draw line from origin to point
-    ax.plot([0, easting], [0, northing], 'r-', linewidth=2.5, label=f'Distance: {distance:.2f}m')
-    
-    # Plot origin point
-    ax.plot(0, 0, 'go', markersize=12, label='Origin', zorder=5)
-    
-    # Plot target point
-    ax.plot(easting, northing, 'ro', markersize=15, label='Target Point', zorder=5)
+    fig.add_trace(go.Scatter(
+        x=[0, easting], y=[0, northing], mode='lines',
+        line=dict(color='red', width=2.5),
+        name=f'Distance: {distance:.2f}m'
+    ))
+    
+    # Plot target point as a fixed-size circle shape rather than a marker trace
+    fig.add_shape(
+        type='circle', xsizemode='pixel', ysizemode='pixel',
+        xanchor=easting, yanchor=northing, x0=-7.5, x1=7.5, y0=-7.5, y1=7.5,
+        fillcolor='red', line=dict(color='red'),
+        name='Target Point', showlegend=True
+    )
     
     # Add coordinate annotation
-    offset = max_val * 0.05
-    ax.annotate(f'({northing:.2f}, {easting:.2f})',
-                xy=(easting, northing),
-                xytext=(easting + offset, northing + offset),
-                fontsize=10,
-                bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.7),
-                arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0', color='black'))
-    
-    # Add origin label
-    ax.annotate('Origin (0, 0)',
-                xy=(0, 0),
-                xytext=(offset, -offset*2),
-                fontsize=10,
-                bbox=dict(boxstyle='round,pad=0.5', facecolor='lightgreen', alpha=0.7))
-    
-    # Add cardinal direction labels
-    label_offset = max_val * 0.9
-    ax.text(0, label_offset, 'N', fontsize=16, color='blue', ha='center', weight='bold')
-    ax.text(label_offset, 0, 'E', fontsize=16, color='blue', va='center', weight='bold')
-    ax.text(0, -label_offset, 'S', fontsize=16, color='blue', ha='center', weight='bold')
-    ax.text(-label_offset, 0, 'W', fontsize=16, color='blue', va='center', weight='bold')
-    
-    # Labels and title
-    ax.set_xlabel('Easting (m)', fontsize=12, weight='bold')
-    ax.set_ylabel('Northing (m)', fontsize=12, weight='bold')
-    ax.set_title('Coordinate Visualization', fontsize=14, weight='bold', pad=20)
-    
-    # Legend
-    ax.legend(loc='upper right', fontsize=10, framealpha=0.9)
+    fig.add_annotation(
+        x=easting, y=northing,
+        text=f'({northing:.2f}, {easting:.2f})',
+        showarrow=True, arrowhead=2, ax=40, ay=-40,
+        bgcolor='yellow', opacity=0.8
+    )
     
-    # Style
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_linewidth(1.5)
-    ax.spines['bottom'].set_linewidth(1.5)
+    # Limits are the only axis setting that depends on the inputs
+    fig.update_xaxes(range=[-max_val, max_val])
+    fig.update_yaxes(range=[-max_val, max_val])
     
-    plt.tight_layout()
+    return fig.to_dict()
+
+
+def create_batch_overview(northing: np.ndarray, easting: np.ndarray) -> go.Figure:
+    """Plot a batch of points, binned into a heatmap once there are too many to draw individually"""
+    # Overflowing inputs (e.g. 1e400) convert to inf or NaN, which histogram2d cannot bin
+    finite = np.isfinite(northing) & np.isfinite(easting)
+    if not finite.all():
+        northing, easting = northing[finite], easting[finite]
+    if northing.size > OVERVIEW_HEATMAP_THRESHOLD:
+        # Rendering cost now depends on the bin count, not the number of points
+        counts, easting_edges, northing_edges = np.histogram2d(easting, northing, bins=256)
+        trace = go.Heatmap(z=counts.T, x=easting_edges, y=northing_edges, colorscale='Viridis')
+    else:
+        trace = go.Scattergl(
+            x=easting, y=northing, mode='markers',
+            marker=dict(color='red', size=6)
+        )
     
+    fig = go.Figure(trace)
+    fig.update_layout(
+        title=dict(text='<b>Batch Overview</b>', x=0.5),
+        xaxis=dict(title='<b>Easting (m)</b>'),
+        yaxis=dict(title='<b>Northing (m)</b>', scaleanchor='x', scaleratio=1),
+        height=600
+    )
     return fig
 
 
@@ -163,7 +305,10 @@ st.markdown('<div class="main-header"><h1>🇰🇪 Kenya Coordinate Converter</h
 # Create tabs for better organization
 tab1, tab2, tab3 = st.tabs(["🔄 Converter", "📊 Batch Processing", "ℹ️ Help"])
 
-with tab1:
+
+@st.fragment
+def converter_tab():
+    """Single-coordinate converter; widget changes here rerun only this fragment"""
     # System selection
     col_radio1, col_radio2 = st.columns(2)
     with col_radio1:
@@ -198,13 +343,29 @@ with tab1:
                 key="polar_angle"
             )
         
+        # Keyed on the raw inputs, so 405° doesn't reuse a result converted at 45°
+        inputs = (distance, angle)
+        
         # Normalize angle
         angle = angle % 360
         
-        if st.button("🔄 Convert to Rectangular", type="primary", use_container_width=True, key="btn_polar_to_rect"):
+        # Reruns with unchanged inputs redisplay the stored result instead of reconverting
+        cache = st.session_state.get("p2r_cache")
+        cached = cache is not None and cache[:2] == inputs
+        clicked = st.button("🔄 Convert to Rectangular", type="primary", use_container_width=True, key="btn_polar_to_rect")
+        if not (clicked or cached):
+            # Inputs changed without a click: forget the result so it only
+            # comes back after converting again
+            st.session_state.pop("p2r_cache", None)
+        if clicked or cached:
             try:
-                polar_coord = PolarCoordinate(distance, angle)
-                rect_coord = polar_to_rect(polar_coord)
+                if cached:
+                    rect_coord, fig_dict = cache[2:]
+                else:
+                    polar_coord = PolarCoordinate(distance, angle)
+                    rect_coord = polar_to_rect(polar_coord)
+                    fig_dict = create_coordinate_plot(rect_coord.northing, rect_coord.easting, distance, angle, "polar")
+                    st.session_state["p2r_cache"] = (*inputs, rect_coord, fig_dict)
                 
                 st.success("✅ Conversion Complete!")
                 
@@ -221,30 +382,13 @@ with tab1:
                 # Visualization
                 st.divider()
                 st.markdown("### 📍 Coordinate Visualization")
-                fig = create_coordinate_plot(rect_coord.northing, rect_coord.easting, distance, angle, "polar")
-                st.pyplot(fig, use_container_width=True)
+                st.plotly_chart(fig_dict, use_container_width=True)
                 
                 # Additional information
                 with st.expander("📋 Detailed Information"):
-                    quadrant = ""
-                    if rect_coord.northing >= 0 and rect_coord.easting >= 0:
-                        quadrant = "NE (First Quadrant)"
-                    elif rect_coord.northing >= 0 and rect_coord.easting < 0:
-                        quadrant = "NW (Second Quadrant)"
-                    elif rect_coord.northing < 0 and rect_coord.easting < 0:
-                        quadrant = "SW (Third Quadrant)"
-                    else:
-                        quadrant = "SE (Fourth Quadrant)"
+                    quadrant = quadrant_name(rect_coord.northing, rect_coord.easting)
                     
-                    bearing = angle
-                    if bearing > 90 and bearing <= 180:
-                        bearing_text = f"S {180 - bearing:.2f}° E"
-                    elif bearing > 180 and bearing <= 270:
-                        bearing_text = f"S {bearing - 180:.2f}° W"
-                    elif bearing > 270:
-                        bearing_text = f"N {360 - bearing:.2f}° W"
-                    else:
-                        bearing_text = f"N {bearing:.2f}° E"
+                    bearing_text = bearing_string(angle)
                     
                     st.write(f"**Quadrant:** {quadrant}")
                     st.write(f"**Bearing:** {bearing_text}")
@@ -276,10 +420,23 @@ with tab1:
                 key="rect_easting"
             )
         
-        if st.button("🔄 Convert to Polar", type="primary", use_container_width=True, key="btn_rect_to_polar"):
+        # Reruns with unchanged inputs redisplay the stored result instead of reconverting
+        cache = st.session_state.get("r2p_cache")
+        cached = cache is not None and cache[:2] == (northing, easting)
+        clicked = st.button("🔄 Convert to Polar", type="primary", use_container_width=True, key="btn_rect_to_polar")
+        if not (clicked or cached):
+            # Inputs changed without a click: forget the result so it only
+            # comes back after converting again
+            st.session_state.pop("r2p_cache", None)
+        if clicked or cached:
             try:
-                rect_coord = RectangularCoordinate(northing, easting)
-                polar_coord = rect_to_polar(rect_coord)
+                if cached:
+                    polar_coord, fig_dict = cache[2:]
+                else:
+                    rect_coord = RectangularCoordinate(northing, easting)
+                    polar_coord = rect_to_polar(rect_coord)
+                    fig_dict = create_coordinate_plot(northing, easting, polar_coord.distance, polar_coord.angle, "rect")
+                    st.session_state["r2p_cache"] = (northing, easting, polar_coord, fig_dict)
                 
                 st.success("✅ Conversion Complete!")
                 
@@ -296,30 +453,13 @@ with tab1:
                 # Visualization
                 st.divider()
                 st.markdown("### 📍 Coordinate Visualization")
-                fig = create_coordinate_plot(northing, easting, polar_coord.distance, polar_coord.angle, "rect")
-                st.pyplot(fig, use_container_width=True)
+                st.plotly_chart(fig_dict, use_container_width=True)
                 
                 # Additional information
                 with st.expander("📋 Detailed Information"):
-                    quadrant = ""
-                    if northing >= 0 and easting >= 0:
-                        quadrant = "NE (First Quadrant)"
-                    elif northing >= 0 and easting < 0:
-                        quadrant = "NW (Second Quadrant)"
-                    elif northing < 0 and easting < 0:
-                        quadrant = "SW (Third Quadrant)"
-                    else:
-                        quadrant = "SE (Fourth Quadrant)"
+                    quadrant = quadrant_name(northing, easting)
                     
-                    angle = polar_coord.angle
-                    if angle > 90 and angle <= 180:
-                        bearing_text = f"S {180 - angle:.2f}° E"
-                    elif angle > 180 and angle <= 270:
-                        bearing_text = f"S {angle - 180:.2f}° W"
-                    elif angle > 270:
-                        bearing_text = f"N {360 - angle:.2f}° W"
-                    else:
-                        bearing_text = f"N {angle:.2f}° E"
+                    bearing_text = bearing_string(polar_coord.angle)
                     
                     st.write(f"**Quadrant:** {quadrant}")
                     st.write(f"**Bearing:** {bearing_text}")
@@ -328,7 +468,10 @@ with tab1:
             except ValueError as e:
                 st.error(f"❌ Error: {str(e)}")
 
-with tab2:
+
+@st.fragment
+def batch_tab():
+    """Batch converter; widget changes here rerun only this fragment"""
     st.subheader("📊 Batch Coordinate Processing")
     st.write("Process multiple coordinates at once")
     
@@ -345,44 +488,59 @@ with tab2:
             placeholder="100.0, 45.0\n150.0, 90.0\n200.0, 135.0",
             height=150
         )
+        show_overview = st.checkbox("Show aggregated overview", key="overview_polar")
         
         if st.button("Process Batch", type="primary", key="batch_polar_btn"):
             if batch_input.strip():
-                results = []
-                lines = batch_input.strip().split('\n')
+                import pandas as pd
+                
+                values, valid = parse_batch(batch_input)
+                if not valid.all():
+                    skipped = ", ".join(str(line) for line in np.flatnonzero(~valid) + 1)
+                    st.warning(f"⚠️ Skipped invalid lines: {skipped}")
                 
-                for i, line in enumerate(lines, 1):
-                    try:
-                        parts = line.split(',')
-                        if len(parts) == 2:
-                            dist = float(parts[0].strip())
-                            ang = float(parts[1].strip()) % 360
-                            polar = PolarCoordinate(dist, ang)
-                            rect = polar_to_rect(polar)
-                            results.append({
-                                'Row': i,
-                                'Distance (m)': dist,
-                                'Angle (°)': ang,
-                                'Northing (m)': rect.northing,
-                                'Easting (m)': rect.easting
-                            })
-                    except Exception as e:
-                        st.warning(f"⚠️ Error in line {i}: {line}")
+                # One vectorized check replaces PolarCoordinate's per-row validation
+                negative = valid & (values[:, 0] < 0)
+                if negative.any():
+                    skipped = ", ".join(str(line) for line in np.flatnonzero(negative) + 1)
+                    st.warning(f"⚠️ Skipped lines with negative distance: {skipped}")
+                    valid &= ~negative
                 
-                if results:
-                    df = pd.DataFrame(results)
-                    st.success(f"✅ Processed {len(results)} coordinates")
+                try:
+                    if not valid.any():
+                        raise ValueError("No valid coordinates to process")
+                    rows = np.flatnonzero(valid) + 1
+                    dist = values[valid, 0]
+                    ang = values[valid, 1] % 360
+                    north, east = batch_polar_to_rect(dist, ang)
+                    
+                    df = pd.DataFrame({
+                        'Row': rows,
+                        'Distance (m)': dist,
+                        'Angle (°)': ang,
+                        'Northing (m)': north,
+                        'Easting (m)': east
+                    }, copy=False)
+                    st.success(f"✅ Processed {len(df)} coordinates")
                     st.dataframe(df, use_container_width=True)
                     
                     # Download button
-                    csv = df.to_csv(index=False)
+                    # Written in chunks straight to bytes, so no full CSV string is built
+                    csv_buffer = io.BytesIO()
+                    df.to_csv(csv_buffer, index=False, chunksize=16384)
                     st.download_button(
                         "📥 Download Results as CSV",
-                        csv,
+                        csv_buffer,
                         "polar_to_rect_results.csv",
                         "text/csv",
                         key="download_polar"
                     )
+                except ValueError as e:
+                    st.error(f"❌ Error: {str(e)}")
+                else:
+                    # Outside the try, so a plotting failure cannot hide the results
+                    if show_overview:
+                        st.plotly_chart(create_batch_overview(north, east), use_container_width=True)
             else:
                 st.warning("⚠️ No valid coordinates to process")
     
@@ -393,47 +551,61 @@ with tab2:
             placeholder="70.71, 70.71\n0, 150\n-100, 100",
             height=150
         )
+        show_overview = st.checkbox("Show aggregated overview", key="overview_rect")
         
         if st.button("Process Batch", type="primary", key="batch_rect_btn"):
             if batch_input.strip():
-                results = []
-                lines = batch_input.strip().split('\n')
+                import pandas as pd
                 
-                for i, line in enumerate(lines, 1):
-                    try:
-                        parts = line.split(',')
-                        if len(parts) == 2:
-                            north = float(parts[0].strip())
-                            east = float(parts[1].strip())
-                            rect = RectangularCoordinate(north, east)
-                            polar = rect_to_polar(rect)
-                            results.append({
-                                'Row': i,
-                                'Northing (m)': north,
-                                'Easting (m)': east,
-                                'Distance (m)': polar.distance,
-                                'Angle (°)': polar.angle
-                            })
-                    except Exception as e:
-                        st.warning(f"⚠️ Error in line {i}: {line}")
+                values, valid = parse_batch(batch_input)
+                if not valid.all():
+                    skipped = ", ".join(str(line) for line in np.flatnonzero(~valid) + 1)
+                    st.warning(f"⚠️ Skipped invalid lines: {skipped}")
                 
-                if results:
-                    df = pd.DataFrame(results)
-                    st.success(f"✅ Processed {len(results)} coordinates")
+                try:
+                    if not valid.any():
+                        raise ValueError("No valid coordinates to process")
+                    north = values[valid, 0]
+                    east = values[valid, 1]
+                    dist, ang = batch_rect_to_polar(north, east)
+                    
+                    df = pd.DataFrame({
+                        'Row': np.flatnonzero(valid) + 1,
+                        'Northing (m)': north,
+                        'Easting (m)': east,
+                        'Distance (m)': dist,
+                        'Angle (°)': ang
+                    }, copy=False)
+                    st.success(f"✅ Processed {len(df)} coordinates")
                     st.dataframe(df, use_container_width=True)
                     
                     # Download button
-                    csv = df.to_csv(index=False)
+                    # Written in chunks straight to bytes, so no full CSV string is built
+                    csv_buffer = io.BytesIO()
+                    df.to_csv(csv_buffer, index=False, chunksize=16384)
                     st.download_button(
                         "📥 Download Results as CSV",
-                        csv,
+                        csv_buffer,
                         "rect_to_polar_results.csv",
                         "text/csv",
                         key="download_rect"
                     )
+                except ValueError as e:
+                    st.error(f"❌ Error: {str(e)}")
+                else:
+                    # Outside the try, so a plotting failure cannot hide the results
+                    if show_overview:
+                        st.plotly_chart(create_batch_overview(north, east), use_container_width=True)
             else:
                 st.warning("⚠️ No valid coordinates to process")
 
+
+with tab1:
+    converter_tab()
+
+with tab2:
+    batch_tab()
+
 with tab3:
     st.subheader("ℹ️ Help & Information")
     
@@ -0,0 +1,26 @@
+"""Numba-compiled batch kernels; each is None when numba is not installed"""
+import math
+
+try:
+    from numba import guvectorize
+except ImportError:
+    guvectorize = None
+
+DEG2RAD = math.pi / 180.0
+
+
+if guvectorize is not None:
+    @guvectorize(
+        ["void(f8[:], f8[:], f8[:], f8[:])"],
+        "(n),(n)->(n),(n)",
+        cache=True,
+        fastmath=True
+    )
+    def polar_to_rect_kernel(distance, angle, northing, easting):
+        """Convert polar coordinate arrays (angles in degrees) to northings and eastings"""
+        for i in range(distance.shape[0]):
+            angle_rad = angle[i] * DEG2RAD
+            northing[i] = distance[i] * math.cos(angle_rad)
+            easting[i] = distance[i] * math.sin(angle_rad)
+else:
+    polar_to_rect_kernel = None